@@ -9,8 +9,9 @@ Benutzer zur Auswahl von Flügen, die Orchestrierung der Simulationsläufe und
 die Darstellung der Ergebnisse in Form von Metriken, Tabellen und Diagrammen.
 """
 import pandas as pd
-from dataclasses import asdict
 import json
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, datetime
 import os
 import re
@@ -23,7 +24,7 @@ from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 from dotenv import load_dotenv
 
-from engine import SimConfig, run_simulation
+from engine import SimConfig, run_simulations, simulation_executor
 from parameter import (
     TCN_SERVICE_LEVELS,
     DEFAULT_SESSION_STATE,
@@ -60,8 +61,7 @@ def init_session_state():
     Initialisiert den `st.session_state` mit Standardwerten.
     """
     for k, v in DEFAULT_SESSION_STATE.items():
-        if k not in st.session_state:
-            st.session_state[k] = v
+        st.session_state.setdefault(k, v)
 
 
 def build_results_export_dataframe(
@@ -842,6 +842,37 @@ from settings_sidebar import render_settings_sidebar
 render_settings_sidebar(show_sim_button=True)
 
 
+@st.cache_resource(show_spinner=False)
+def _get_simulation_executor() -> ProcessPoolExecutor | None:
+    """
+    Liefert den Prozesspool für die parallelen T1/T2-Läufe (einmal je Server-Prozess).
+
+    Ein neuer "spawn"-Pool kostet bei jedem Start rund eine Sekunde für Interpreter-
+    und Modulimporte, daher wird er über alle Läufe hinweg wiederverwendet. Mit nur
+    einem CPU-Kern bringt ein Pool keinen Vorteil; dann wird kein Pool erzeugt (None).
+    """
+    if (os.cpu_count() or 1) < 2:
+        return None
+    return simulation_executor(max_workers=2)
+
+
+def run_terminal_simulations(jobs: list, t0: pd.Timestamp) -> list:
+    """
+    Führt die Simulationsläufe (z.B. T1 und T2) über den gemeinsamen Pool aus.
+
+    Ohne Pool oder nach einem Absturz eines Workers laufen die Jobs im aktuellen
+    Prozess; ein defekter Pool wird verworfen und beim nächsten Lauf neu erzeugt.
+    """
+    executor = _get_simulation_executor()
+    if executor is not None:
+        try:
+            return run_simulations(jobs, t0, executor=executor)
+        except BrokenProcessPool:
+            executor.shutdown(wait=False)
+            _get_simulation_executor.clear()
+    return run_simulations(jobs, t0, n_workers=1)
+
+
 def get_schedule_breaches(df_res, t0, service_level_min, groups: list[str], value_col: str, window_min=15):
     """Analysiert Wartezeiten einer Passagiergruppe und identifiziert Service-Level-Verletzungen.
 
@@ -935,7 +966,7 @@ def render_terminal_details(
         with col1:
             with st.container(border=True):
                 st.markdown(f"##### {terminal_id} - P95 Wartezeit/h")
-                plot_terminal_overview_combined(df_res, t0, terminal=terminal_id, cfg=cfg, bin_minutes_heatmap=60)
+                plot_terminal_overview_combined(df_res_term, t0, terminal=terminal_id, cfg=cfg, bin_minutes_heatmap=60)
         with col2:
             with st.container(border=True):
                 st.markdown(f"##### {terminal_id} - Anzahl Personen in Wartschlange/h")
@@ -943,7 +974,7 @@ def render_terminal_details(
     else:
         with st.container(border=True):
             st.markdown(f"##### {terminal_id} - P95 Wartezeit/h")
-            plot_terminal_overview_combined(df_res, t0, terminal=terminal_id, cfg=cfg, bin_minutes_heatmap=60)
+            plot_terminal_overview_combined(df_res_term, t0, terminal=terminal_id, cfg=cfg, bin_minutes_heatmap=60)
         st.info(
             f"Für Terminal {terminal_id} sind keine gespeicherten Warteschlangen-Zeitreihen vorhanden. "
             "Die Queue-Heatmap kann deshalb nicht angezeigt werden."
@@ -1475,6 +1506,7 @@ if import_mode != "Gespeicherter Run":
         service_level_key = st.session_state["tcn_service_level_key"]
         service_level_min = TCN_SERVICE_LEVELS[service_level_key]
 
+        # T1 und T2 sind unabhängig und laufen pro Iteration parallel im gemeinsamen Pool
         with st.status("Simulation läuft... (iterative Kapazitätsanpassung)", expanded=True) as status:
             for i in range(1, max_iterations + 1):
                 status.update(label=f"Simulation läuft... Iteration {i}/{max_iterations}")
@@ -1498,17 +1530,18 @@ if import_mode != "Gespeicherter Run":
                     **sim_params
                 )
 
-                m1 = run_simulation(flights_t1, cfg_t1, t0, seed=run_seed)
-                df_res_t1 = pd.DataFrame([asdict(r) for r in m1.results])
+                (res_t1, qts_t1), (res_t2, qts_t2) = run_terminal_simulations(
+                    [(flights_t1, cfg_t1, run_seed), (flights_t2, cfg_t2, run_seed)], t0
+                )
+                df_res_t1 = res_t1.to_dataframe()
                 if not df_res_t1.empty:
                     df_res_t1["wait_total"] = df_res_t1["wait_sss"] + df_res_t1["wait_easypass"] + df_res_t1["wait_eu"] + df_res_t1["wait_tcn"]
-                ts_t1 = m1.queue_ts
+                ts_t1 = qts_t1.to_dataframe()
 
-                m2 = run_simulation(flights_t2, cfg_t2, t0, seed=run_seed)
-                df_res_t2 = pd.DataFrame([asdict(r) for r in m2.results])
+                df_res_t2 = res_t2.to_dataframe()
                 if not df_res_t2.empty:
                     df_res_t2["wait_total"] = df_res_t2["wait_sss"] + df_res_t2["wait_easypass"] + df_res_t2["wait_eu"] + df_res_t2["wait_tcn"]
-                ts_t2 = m2.queue_ts
+                ts_t2 = qts_t2.to_dataframe()
 
                 breaches_tcn_t1 = get_schedule_breaches(df_res_t1, t0, service_level_min, groups=["TCN_V", "TCN_AT"], value_col="wait_tcn")
                 breaches_eu_t1 = get_schedule_breaches(df_res_t1, t0, service_level_min, groups=["EU_MANUAL"], value_col="wait_eu")
@@ -1542,9 +1575,9 @@ if import_mode != "Gespeicherter Run":
                     status.update(label="Maximale Iterationen erreicht.", state="error")
 
         st.session_state["last_df_res_t1"] = df_res_t1
-        st.session_state["last_df_ts_t1"] = pd.DataFrame(ts_t1)
+        st.session_state["last_df_ts_t1"] = ts_t1
         st.session_state["last_df_res_t2"] = df_res_t2
-        st.session_state["last_df_ts_t2"] = pd.DataFrame(ts_t2)
+        st.session_state["last_df_ts_t2"] = ts_t2
         st.session_state["last_cfg_t1"] = cfg_t1
         st.session_state["last_cfg_t2"] = cfg_t2
         st.session_state["last_t0"] = t0
@@ -7,13 +7,17 @@ des Grenzkontrollprozesses mittels `simpy`. Es definiert die Datenstrukturen
 für die Konfiguration und die Ergebnisse, die Simulationsprozesse für Passagiere
 und die dynamische Ressourcenverwaltung.
 """
-from collections import Counter, defaultdict
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache, partial
 import math
+import multiprocessing
 
+import numpy as np
 import pandas as pd
 import random
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 import simpy
 
@@ -28,14 +32,21 @@ from parameter import (
 )
 
 
-# Interne Gruppen
+# Interne Gruppen; intern wird mit den Codes (Index in GROUPS) gearbeitet
 GROUPS = ["EASYPASS", "EU_MANUAL", "TCN_AT", "TCN_V"]
+GROUP_EASYPASS, GROUP_EU_MANUAL, GROUP_TCN_AT, GROUP_TCN_V = range(len(GROUPS))
+
+# Stationen und Transportmodi (Codes analog zu GROUPS)
+STATIONS = ["SSS", "EASYPASS", "EU", "TCN"]
+STATION_SSS, STATION_EASYPASS, STATION_EU, STATION_TCN = range(len(STATIONS))
+TRANSPORT_MODES = ["Walk", "Bus"]
+TRANSPORT_WALK, TRANSPORT_BUS = range(len(TRANSPORT_MODES))
 
 
 # =========================================================
 # Datenstrukturen: Konfiguration und Ergebnisse
 # =========================================================
-@dataclass
+@dataclass(slots=True)
 class SimConfig:
     """Datenklasse zur Speicherung aller Konfigurationsparameter für einen Simulationslauf."""
     
@@ -96,99 +107,319 @@ class SimConfig:
     # Routing-Heuristik für TCN-AT
     tcn_at_target: str = "EASYPASS"  # "EASYPASS", "EU", oder "TCN"
 
+    # Abtastintervall der Warteschlangen-Zeitreihe (in Minuten, > 0). Die Zeitreihe
+    # enthält nur die Warteschlangenlängen zu diesen Zeitpunkten; kürzere Spitzen
+    # zwischen zwei Abtastungen erscheinen nicht (z.B. im Maximum der Heatmap).
+    queue_snapshot_min: float = 0.25
+
+    def __post_init__(self):
+        if not self.queue_snapshot_min > 0:
+            raise ValueError(f"queue_snapshot_min must be > 0, got {self.queue_snapshot_min!r}")
+
 # =========================
 # Ergebnisstruktur
 # =========================
-@dataclass
-class PassengerResult:
-    """Datenklasse zur Speicherung der detaillierten Ergebnisse für einen einzelnen Passagier."""
-    
-    flight_key: str
-    fln: str
-    ppos: str
-    pax_id: int
-    group: str
-    transport_mode: str
-
-    arrival_min: float
-    exit_min: float
-    system_min: float
-
-    wait_sss: float = 0.0
-    serv_sss: float = 0.0
-    wait_easypass: float = 0.0
-    serv_easypass: float = 0.0
-    wait_eu: float = 0.0
-    serv_eu: float = 0.0
-    wait_tcn: float = 0.0
-    serv_tcn: float = 0.0
-
-    used_sss: bool = False
-    used_easypass: bool = False
-    used_eu: bool = False
-    used_tcn: bool = False
+# Spalten von `PassengerResults.to_dataframe()` (ein Passagier je Zeile)
+RESULT_COLS = (
+    "flight_key", "fln", "ppos", "pax_id", "group", "transport_mode",
+    "arrival_min", "exit_min", "system_min",
+    "wait_sss", "serv_sss",
+    "wait_easypass", "serv_easypass",
+    "wait_eu", "serv_eu",
+    "wait_tcn", "serv_tcn",
+    "used_sss", "used_easypass", "used_eu", "used_tcn",
+)
+
+
+class PassengerResults:
+    """
+    Spaltenweise Ablage (Structure of Arrays) aller Passagierergebnisse.
+
+    Statt einer Liste von Objekten werden die Werte in vorab allokierten
+    NumPy-Arrays gehalten. Flug, Gruppe und Transportmodus liegen als
+    ganzzahlige Codes vor (Flüge über die Intern-Tabelle `flights`, Gruppen
+    und Transportmodi als Index in `GROUPS` bzw. `TRANSPORT_MODES`). Warte-,
+    Servicezeiten und Nutzung sind Matrizen mit einer Spalte je Station
+    (Reihenfolge wie `STATIONS`). Die Spalten von `to_dataframe` sind in
+    `RESULT_COLS` festgelegt.
+    """
+
+    def __init__(self, capacity: int = 0):
+        capacity = max(int(capacity), 16)
+        self._n = 0
+        self.flight_code = np.empty(capacity, dtype=np.int32)
+        self.pax_id = np.empty(capacity, dtype=np.int32)
+        self.group_code = np.empty(capacity, dtype=np.int8)
+        self.transport_code = np.empty(capacity, dtype=np.int8)
+        self.arrival_min = np.empty(capacity, dtype=np.float64)
+        self.exit_min = np.empty(capacity, dtype=np.float64)
+        self.wait = np.zeros((capacity, len(STATIONS)), dtype=np.float64)
+        self.serv = np.zeros((capacity, len(STATIONS)), dtype=np.float64)
+        self.used = np.zeros((capacity, len(STATIONS)), dtype=bool)
+
+        # Intern-Tabelle je Flug: (flight_key, fln, ppos)
+        self.flights: List[Tuple[str, str, str]] = []
+        self._flight_index: Dict[Tuple[str, str, str], int] = {}
+
+    def __len__(self) -> int:
+        return self._n
+
+    def intern_flight(self, flight_key: str, fln: str, ppos: str) -> int:
+        """Gibt den Code eines Fluges zurück und legt ihn bei Bedarf neu an."""
+        flight = (flight_key, fln, ppos)
+        code = self._flight_index.get(flight)
+        if code is None:
+            code = self._flight_index[flight] = len(self.flights)
+            self.flights.append(flight)
+        return code
+
+    def _grow(self):
+        n = self._n
+        new_cap = 2 * len(self.pax_id)
+        for c in ("flight_code", "pax_id", "group_code", "transport_code", "arrival_min", "exit_min", "wait", "serv", "used"):
+            arr = getattr(self, c)
+            grown = np.zeros((new_cap,) + arr.shape[1:], dtype=arr.dtype)
+            grown[:n] = arr[:n]
+            setattr(self, c, grown)
+
+    def append(
+        self,
+        flight_code: int,
+        pax_id: int,
+        group_code: int,
+        transport_code: int,
+        arrival_min: float,
+        exit_min: float,
+        visits: Tuple[Tuple[int, float, float], ...],
+    ):
+        """
+        Schreibt das Ergebnis eines Passagiers in die nächste freie Zeile.
+
+        Args:
+            visits: Besuchte Stationen als Tupel (Stationscode, Wartezeit, Servicezeit).
+        """
+        i = self._n
+        if i >= len(self.pax_id):
+            self._grow()
+
+        self.flight_code[i] = flight_code
+        self.pax_id[i] = pax_id
+        self.group_code[i] = group_code
+        self.transport_code[i] = transport_code
+        self.arrival_min[i] = arrival_min
+        self.exit_min[i] = exit_min
+        for station, wait, serv in visits:
+            self.wait[i, station] += wait
+            self.serv[i, station] += serv
+            self.used[i, station] = True
+        self._n = i + 1
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Gibt alle Ergebnisse als DataFrame mit den Spalten `RESULT_COLS` zurück."""
+        n = self._n
+        if n == 0:
+            return pd.DataFrame()
+
+        flights = np.empty(len(self.flights), dtype=object)
+        flights[:] = self.flights
+        flight_rows = flights[self.flight_code[:n]]
+        groups = np.asarray(GROUPS, dtype=object)
+        modes = np.asarray(TRANSPORT_MODES, dtype=object)
+
+        data: Dict[str, Any] = {
+            "flight_key": [f[0] for f in flight_rows],
+            "fln": [f[1] for f in flight_rows],
+            "ppos": [f[2] for f in flight_rows],
+            "pax_id": self.pax_id[:n].astype(np.int64),
+            "group": groups[self.group_code[:n]],
+            "transport_mode": modes[self.transport_code[:n]],
+            "arrival_min": self.arrival_min[:n].copy(),
+            "exit_min": self.exit_min[:n].copy(),
+            "system_min": self.exit_min[:n] - self.arrival_min[:n],
+        }
+        for j, station in enumerate(STATIONS):
+            s = station.lower()
+            data[f"wait_{s}"] = self.wait[:n, j].copy()
+            data[f"serv_{s}"] = self.serv[:n, j].copy()
+        for j, station in enumerate(STATIONS):
+            data[f"used_{station.lower()}"] = self.used[:n, j].copy()
+        return pd.DataFrame(data)
+
+
+QUEUE_TS_COLS = (
+    "t_min",
+    "q_sss", "in_sss",
+    "q_easypass", "in_easypass",
+    "q_eu", "in_eu",
+    "q_tcn", "in_tcn",
+)
+
+
+# Strukturierter Datentyp einer Zeile der Warteschlangen-Zeitreihe
+QUEUE_TS_DTYPE = np.dtype([("t_min", np.float64)] + [(c, np.int32) for c in QUEUE_TS_COLS[1:]])
+
+
+class QueueSnapshots:
+    """
+    Zeitreihe der Warteschlangenlängen und Ressourcennutzung als strukturiertes NumPy-Array.
+
+    Jede Zeile ist ein Schnappschuss mit den Feldern aus `QUEUE_TS_COLS`
+    (Zeit als float64, Zähler als int32).
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._n = 0
+        self._data = np.zeros(max(int(capacity), 16), dtype=QUEUE_TS_DTYPE)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, row: Tuple[float, ...]):
+        """Hängt einen Schnappschuss (Werte in der Reihenfolge von `QUEUE_TS_COLS`) an."""
+        i = self._n
+        if i >= len(self._data):
+            grown = np.zeros(2 * len(self._data), dtype=QUEUE_TS_DTYPE)
+            grown[:i] = self._data[:i]
+            self._data = grown
+        self._data[i] = row
+        self._n = i + 1
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Gibt die Zeitreihe als DataFrame mit den Spalten `QUEUE_TS_COLS` zurück."""
+        return pd.DataFrame(self._data[:self._n])
 
 
 # =========================================================
 # Statistische Hilfsfunktionen
 # =========================================================
-def _pos_normal(rng: random.Random, mean: float, sd: float, floor: float = 0.05) -> float:
+class _NormalPool:
+    """
+    Puffer für standardnormalverteilte Zufallszahlen.
+
+    Die Werte werden blockweise über `numpy.random.Generator.standard_normal`
+    gezogen und einzeln abgegeben. Das spart den Python-Overhead von
+    `random.normalvariate` pro Passagier und Station.
+    """
+
+    __slots__ = ("_gen", "_size", "_buf", "_idx")
+
+    def __init__(self, gen: np.random.Generator, size: int = 4096):
+        self._gen = gen
+        self._size = size
+        self._buf: List[float] = []
+        self._idx = 0
+
+    def draw(self) -> float:
+        """Gibt die nächste standardnormalverteilte Zufallszahl zurück."""
+        idx = self._idx
+        if idx >= len(self._buf):
+            self._buf = self._gen.standard_normal(self._size).tolist()
+            idx = 0
+        self._idx = idx + 1
+        return self._buf[idx]
+
+    def draw_many(self, n: int) -> np.ndarray:
+        """Gibt die nächsten `n` Zufallszahlen als Array zurück (gleiche Folge wie `draw`)."""
+        out = np.empty(n, dtype=np.float64)
+        filled = 0
+        while filled < n:
+            if self._idx >= len(self._buf):
+                self._buf = self._gen.standard_normal(self._size).tolist()
+                self._idx = 0
+            take = min(n - filled, len(self._buf) - self._idx)
+            out[filled:filled + take] = self._buf[self._idx:self._idx + take]
+            self._idx += take
+            filled += take
+        return out
+
+
+# Ein eigener Pool je Verteilung, damit sich die Ziehungen nicht gegenseitig verschieben.
+_POOL_KEYS = ("SSS", "EASYPASS", "EU", "TCN", "WALK")
+
+
+def _make_normal_pools(rng: random.Random) -> Dict[str, _NormalPool]:
+    """Erzeugt reproduzierbare Normalverteilungs-Pools, abgeleitet vom Seed von `rng`."""
+    seq = np.random.SeedSequence(rng.getrandbits(64))
+    return {
+        key: _NormalPool(np.random.default_rng(child))
+        for key, child in zip(_POOL_KEYS, seq.spawn(len(_POOL_KEYS)))
+    }
+
+
+def _pos_normal(pool: _NormalPool, mean: float, sd: float, floor: float = 0.05) -> float:
     """Generiert eine normalverteilte Zufallszahl, die nicht unter `floor` fällt."""
-    return max(floor, rng.normalvariate(mean, sd))
+    return max(floor, mean + sd * pool.draw())
 
 
-def _lognorm(rng: random.Random, mu: float, sigma: float, cap: float, floor: float = 0.05) -> float:
+def _lognorm(pool: _NormalPool, mu: float, sigma: float, cap: float, floor: float = 0.05) -> float:
     """Generiert eine lognormal-verteilte Zufallszahl mit einem Minimum (floor) und Maximum (cap)."""
     if sigma <= 0:
         # Wenn sigma 0 ist, ist die Verteilung eine einzelne Spitze bei exp(mu).
         # Wir geben diesen Wert zurück, aber beachten floor und cap.
         return min(cap, max(floor, math.exp(mu)))
 
-    val = rng.lognormvariate(mu, sigma)
+    val = math.exp(mu + sigma * pool.draw())
     return min(cap, max(floor, val))
 
 
-def _service_time_min(
+def _build_service_samplers(
     cfg: SimConfig,
-    rng: random.Random,
-    station: str,
-    group: str | None = None,
-) -> float:
+    pools: Dict[str, _NormalPool],
+) -> Dict[Tuple[str, Optional[int]], Callable[[], float]]:
     """
-    Berechnet die Servicezeit für eine gegebene Station in Minuten.
+    Erzeugt die Servicezeit-Sampler je (Station, Gruppe) für einen Simulationslauf.
+
+    Die Verteilungsparameter werden einmalig aus `cfg` gelesen, sodass pro
+    Servicevorgang nur noch ein Dictionary-Lookup nötig ist.
 
     Args:
         cfg: Die Simulationskonfiguration.
-        rng: Der Zufallszahlengenerator.
-        station: Der Name der Station (z.B. "SSS", "TCN").
-        group: Die Passagiergruppe (relevant für TCN).
+        pools: Die Normalverteilungs-Pools je Station (siehe `_make_normal_pools`).
 
     Returns:
-        Die Servicezeit in Minuten.
+        Ein Dictionary `(station, group) -> sampler`, wobei `sampler()` die
+        Servicezeit in Sekunden liefert. `group` ist der Gruppencode und nur
+        für TCN relevant, sonst `None`.
     """
+    tcn = partial(_lognorm, pools["TCN"], cfg.mu_tcn_v_s, cfg.sigma_tcn_v_s, cfg.max_tcn_v_s)
+    return {
+        # ---- SSS ----
+        ("SSS", None): partial(_pos_normal, pools["SSS"], cfg.mean_sss_s, cfg.sd_sss_s),
+        # ---- Easypass / EU unverändert ----
+        ("EASYPASS", None): partial(_lognorm, pools["EASYPASS"], cfg.mu_easypass_s, cfg.sigma_easypass_s, cfg.max_easypass_s),
+        ("EU", None): partial(_lognorm, pools["EU"], cfg.mu_eu_s, cfg.sigma_eu_s, cfg.max_eu_s),
+        # ---- TCN: V x reg/unreg ----
+        ("TCN", GROUP_TCN_V): tcn,
+        ("TCN", GROUP_TCN_AT): tcn,
+    }
 
-    # ---- SSS ----
-    if station == "SSS":
-        return _pos_normal(rng, cfg.mean_sss_s, cfg.sd_sss_s) / 60.0
-
-    # ---- Easypass / EU unverändert ----
-    if station == "EASYPASS":
-        return _lognorm(rng, cfg.mu_easypass_s, cfg.sigma_easypass_s, cfg.max_easypass_s) / 60.0
 
-    if station == "EU":
-        return _lognorm(rng, cfg.mu_eu_s, cfg.sigma_eu_s, cfg.max_eu_s) / 60.0
+def _service_time_min(
+    samplers: Dict[Tuple[str, Optional[int]], Callable[[], float]],
+    station: str,
+    group: int | None = None,
+) -> float:
+    """
+    Berechnet die Servicezeit für eine gegebene Station in Minuten.
 
-    # ---- TCN: V x reg/unreg ----
-    if station == "TCN":
-        if group in ("TCN_V", "TCN_AT"):
-            return _lognorm(rng, cfg.mu_tcn_v_s, cfg.sigma_tcn_v_s, cfg.max_tcn_v_s) / 60.0
+    Args:
+        samplers: Die Servicezeit-Sampler (siehe `_build_service_samplers`).
+        station: Der Name der Station (z.B. "SSS", "TCN").
+        group: Der Gruppencode des Passagiers (nur relevant für TCN).
 
-    raise ValueError(station)
+    Returns:
+        Die Servicezeit in Minuten.
+    """
+    try:
+        sampler = samplers[(station, group)]
+    except KeyError:
+        raise ValueError(station) from None
+    return sampler() / 60.0
 
 
-def _walk_time_min(cfg: SimConfig, rng: random.Random, distance_m: float) -> float:
-    """Berechnet die Gehzeit eines Passagiers für eine gegebene Distanz in Minuten."""
-    speed = max(cfg.walk_speed_floor_mps, rng.normalvariate(cfg.walk_speed_mean_mps, cfg.walk_speed_sd_mps))
+def _walk_times_min(cfg: SimConfig, pool: _NormalPool, distance_m: float, n: int) -> np.ndarray:
+    """Berechnet die Gehzeiten von `n` Passagieren für eine gegebene Distanz in Minuten."""
+    speed = np.maximum(cfg.walk_speed_floor_mps, cfg.walk_speed_mean_mps + cfg.walk_speed_sd_mps * pool.draw_many(n))
     seconds = distance_m / speed
     return seconds / 60.0
 
@@ -211,18 +442,22 @@ class _DisabledResource:
         capacity (int): Immer 0.
 
     - `queue`, `count`, `capacity` attributes are present for snapshot inspection.
-    - `request()` returns a context manager whose __enter__ returns an immediately triggered
-      env.timeout(0) event so `with res.request() as req: yield req` still works if ever used.
+    - `request()` returns a shared context manager whose __enter__ returns one already
+      triggered event, so `with res.request() as req: yield req` continues without
+      scheduling a new event per request.
     """
     def __init__(self, env: simpy.Environment):
         self.queue: list = []
         self.count: int = 0
         self.capacity: int = 0
         self._env = env
+        fired = env.event()
+        fired.succeed()
+        self._ctx = _DisabledResource._ReqCtx(fired)
 
     class _ReqCtx:
-        def __init__(self, env: simpy.Environment):
-            self._event = env.timeout(0)
+        def __init__(self, event: simpy.Event):
+            self._event = event
 
         def __enter__(self):
             return self._event
@@ -231,7 +466,7 @@ class _DisabledResource:
             return False
 
     def request(self):
-        return _DisabledResource._ReqCtx(self._env)
+        return self._ctx
 
 class BorderControlModel:
     """
@@ -245,6 +480,9 @@ class BorderControlModel:
         self.env = env
         self.cfg = cfg
         self.rng = rng
+        self.normal_pools = _make_normal_pools(rng)
+        self.np_rng = np.random.default_rng(rng.getrandbits(64))
+        self._svc_samplers = _build_service_samplers(cfg, self.normal_pools)
         self.t0 = t0
         self.expected_passengers = expected_passengers
         self.all_passengers_done = env.event()
@@ -280,18 +518,48 @@ class BorderControlModel:
         self.env.process(self.eu_dispatcher())
         self.env.process(self.eu_capacity_manager())
 
-        self.results: List[PassengerResult] = []
-        self.queue_ts: List[Dict[str, Any]] = []
+        # Pro Lauf konstante Werte einmalig auflösen
+        self._changeover_min = cfg.changeover_s / 60.0
+        self._do_sss = self._make_resource_proc(self.sss, "SSS")
+        self._do_easypass = self._make_resource_proc(self.easypass, "EASYPASS")
+        # Routing je Gruppencode (Reihenfolge wie GROUPS); das Ziel für TCN-AT
+        # ändert sich während eines Laufs nicht und wird hier einmalig gewählt.
+        tcn_at_routes = {"EASYPASS": self._route_easypass, "EU": self._route_eu, "TCN": self._route_tcn}
+        self._routes = (
+            self._route_easypass,
+            self._route_eu,
+            tcn_at_routes.get(cfg.tcn_at_target, self._route_none),
+            self._route_tcn_v,
+        )
+
+        self.results = PassengerResults(expected_passengers)
+        # Vorab Platz für einen ganzen Tag im Snapshot-Raster reservieren
+        self.queue_ts = QueueSnapshots(capacity=int(24 * 60 / cfg.queue_snapshot_min) + 1)
+        self.env.process(self.snapshot_proc())
+
+    def snapshot(self):
+        """Erstellt einen Schnappschuss der aktuellen Warteschlangenlängen und Ressourcennutzung."""
+        self.queue_ts.append((
+            float(self.env.now),
+            len(self.sss.queue), self.sss.count,
+            len(self.easypass.queue), self.easypass.count,
+            len(self.eu_waiters.items), self.eu_in_use,
+            len(self.tcn.get_queue), self.tcn_in_use,
+        ))
+
+    def snapshot_proc(self):
+        """
+        Zeichnet die Warteschlangen in einem festen Zeitraster (`cfg.queue_snapshot_min`) auf.
 
-    def snapshot(self):
-        """Erstellt einen Schnappschuss der aktuellen Warteschlangenlängen und Ressourcennutzung."""
-        self.queue_ts.append({
-            "t_min": float(self.env.now),
-            "q_sss": len(self.sss.queue), "in_sss": self.sss.count,
-            "q_easypass": len(self.easypass.queue), "in_easypass": self.easypass.count,
-            "q_eu": len(self.eu_waiters.items), "in_eu": self.eu_in_use,
-            "q_tcn": len(self.tcn.get_queue), "in_tcn": self.tcn_in_use,
-        })
+        Ein fester Takt statt eines Schnappschusses bei jedem Stationswechsel hält
+        den Aufwand unabhängig von der Passagierzahl.
+        """
+        dt = self.cfg.queue_snapshot_min
+        step = 0
+        while True:
+            self.snapshot()
+            step += 1
+            yield self.env.timeout(step * dt - self.env.now)
 
     def eu_manual_waiting(self) -> bool:
         """Prüft, ob aktuell Passagiere der Gruppe EU_MANUAL auf einen Schalter warten."""
@@ -334,92 +602,72 @@ class BorderControlModel:
                 server = yield self.eu_servers.get()
                 _, _, assigned_event = yield self.eu_waiters.get()
                 self.eu_in_use += 1
-                self.snapshot()
                 assigned_event.succeed(server)
             yield self.eu_dispatch_signal
 
-    def do_station(self, station: str, pr: PassengerResult, eu_priority: int = 0):
+    # Die stationsspezifischen Prozesse sind bewusst getrennt ausformuliert, damit
+    # im Hot Path kein Vergleich auf den Stationsnamen nötig ist. Die Umrüstzeit
+    # (`changeover`) wird direkt mit der Servicezeit in einem Timeout abgewartet.
+    # Alle Prozesse geben (Wartezeit, Servicezeit) in Minuten zurück.
+    def _make_resource_proc(self, resource: Any, station: str):
         """
-        Simuliert den Prozess des Anforderns und Nutzens einer Servicestation.
-
-        Dieser Generator-Prozess kümmert sich um das Anstellen, Warten,
-        die Service-Abwicklung und das Sammeln der entsprechenden Zeitstempel.
+        Erzeugt den Stationsprozess für eine Station mit `simpy.Resource` (SSS, Easypass).
 
-        Args:
-            station: Die zu nutzende Station (z.B. "SSS", "EU").
-            pr: Das Ergebnisobjekt des Passagiers, in das die Zeiten geschrieben werden.
-            eu_priority: Die Priorität für den EU-Schalter (0 für EU_MANUAL, 1 für TCN_V).
+        Ressource, Servicezeit-Sampler und Umrüstzeit werden einmalig in der
+        Closure gebunden.
         """
-        self.snapshot()
+        env = self.env
+        timeout = env.timeout
+        request = resource.request
+        sampler = self._svc_samplers[(station, None)]
+        changeover_min = self._changeover_min
+
+        def proc():
+            t_arr = float(env.now)
+            with request() as req:
+                yield req
+                t_start = float(env.now)
+                serv = sampler() / 60.0
+                yield timeout(serv + changeover_min)
+            return t_start - t_arr, serv
+
+        return proc
+
+    def _do_eu(self, eu_priority: int = 0):
+        """Stationsprozess für die EU-Schalter mit globaler Prioritätswarteschlange."""
         t_arr = float(self.env.now)
-        changeover_min = self.cfg.changeover_s / 60.0
+        if eu_priority == 0:
+            self.eu_manual_wait_count += 1
+
+        assigned_event = self.env.event()
+        self.eu_request_seq += 1
+        yield self.eu_waiters.put((eu_priority, self.eu_request_seq, assigned_event))
+        self._notify_eu_dispatcher()
+
+        server_resource = yield assigned_event
+        if eu_priority == 0:
+            self.eu_manual_wait_count -= 1
+        t_start = float(self.env.now)
+        serv = _service_time_min(self._svc_samplers, "EU")
+        yield self.env.timeout(serv + self._changeover_min)
+
+        yield from self._release_eu_server(server_resource)
+        self.eu_in_use -= 1
+        return t_start - t_arr, serv
+
+    def _do_tcn(self, group: int):
+        """Stationsprozess für die TCN-Schalter mit zeitabhängiger Kapazität."""
+        t_arr = float(self.env.now)
+        server = yield self.tcn.get()
+        self.tcn_in_use += 1
 
-        if station == "SSS":
-            with self.sss.request() as req:
-                yield req
-                t_start = float(self.env.now)
-                serv = _service_time_min(self.cfg, self.rng, "SSS", pr.group)
-                yield self.env.timeout(serv)
-                if changeover_min > 0:
-                    yield self.env.timeout(changeover_min)
-            pr.used_sss = True
-            pr.wait_sss += t_start - t_arr
-            pr.serv_sss += serv
-
-        elif station == "EASYPASS":
-            with self.easypass.request() as req:
-                yield req
-                t_start = float(self.env.now)
-                serv = _service_time_min(self.cfg, self.rng, "EASYPASS")
-                yield self.env.timeout(serv)
-                if changeover_min > 0:
-                    yield self.env.timeout(changeover_min)
-            pr.used_easypass = True
-            pr.wait_easypass += t_start - t_arr
-            pr.serv_easypass += serv
-
-        elif station == "EU":
-            if eu_priority == 0:
-                self.eu_manual_wait_count += 1
-
-            assigned_event = self.env.event()
-            self.eu_request_seq += 1
-            yield self.eu_waiters.put((eu_priority, self.eu_request_seq, assigned_event))
-            self._notify_eu_dispatcher()
-
-            server_resource = yield assigned_event
-            if eu_priority == 0:
-                self.eu_manual_wait_count -= 1
-            t_start = float(self.env.now)
-            serv = _service_time_min(self.cfg, self.rng, "EU")
-            yield self.env.timeout(serv)
-            if changeover_min > 0:
-                yield self.env.timeout(changeover_min)
-
-            yield from self._release_eu_server(server_resource)
-            self.eu_in_use -= 1
-            pr.used_eu = True
-            pr.wait_eu += t_start - t_arr
-            pr.serv_eu += serv
-
-        elif station == "TCN":
-            server = yield self.tcn.get()
-            self.tcn_in_use += 1
-            self.snapshot() # Snapshot after getting server to correctly show queue and usage
-            
-            t_start = float(self.env.now)
-            serv = _service_time_min(self.cfg, self.rng, "TCN", pr.group)
-            yield self.env.timeout(serv)
-            if changeover_min > 0:
-                yield self.env.timeout(changeover_min)
-            
-            yield from self._release_tcn_server(server)
-            self.tcn_in_use -= 1
-            pr.used_tcn = True
-            pr.wait_tcn += t_start - t_arr
-            pr.serv_tcn += serv
-
-        self.snapshot()
+        t_start = float(self.env.now)
+        serv = _service_time_min(self._svc_samplers, "TCN", group)
+        yield self.env.timeout(serv + self._changeover_min)
+
+        yield from self._release_tcn_server(server)
+        self.tcn_in_use -= 1
+        return t_start - t_arr, serv
 
     def tcn_capacity_manager(self):
         """
@@ -545,7 +793,7 @@ class BorderControlModel:
                 self.eu_pending_removals += remove_count - removed_now
             self.current_eu_capacity = new_cap
 
-    def passenger_process(self, flight_key: str, fln: str, ppos: str, pax_id: int, group: str, transport_mode: str = "Walk"):
+    def passenger_process(self, flight_code: int, pax_id: int, group: int, transport_code: int = TRANSPORT_WALK):
         """
         Der Hauptprozess für einen einzelnen Passagier.
 
@@ -555,51 +803,54 @@ class BorderControlModel:
         besucht werden.
 
         Args:
-            Alle Argumente beschreiben den Passagier und seinen Ankunftskontext.
+            flight_code: Code des Fluges (siehe `PassengerResults.intern_flight`).
+            pax_id: Laufende Nummer des Passagiers im Flug.
+            group: Gruppencode (z.B. `GROUP_TCN_V`).
+            transport_code: Transportmodus-Code (`TRANSPORT_WALK` oder `TRANSPORT_BUS`).
         """
 
         arrival = float(self.env.now)
-        pr = PassengerResult(
-            flight_key=flight_key,
-            fln=fln,
-            ppos=ppos,
-            pax_id=pax_id,
-            group=group,
-            transport_mode=transport_mode,
-            arrival_min=arrival,
-            exit_min=arrival,
-            system_min=0.0,
-        )
-
-        if group == "EASYPASS":
-            yield from self.do_station("EASYPASS", pr)
-
-        elif group == "EU_MANUAL":
-            yield from self.do_station("EU", pr, eu_priority=0)
-
-        elif group == "TCN_AT":
-            station = self.cfg.tcn_at_target
-            if station == "EASYPASS":
-                yield from self.do_station("EASYPASS", pr)
-            elif station == "EU":
-                yield from self.do_station("EU", pr, eu_priority=0)
-            elif station == "TCN":
-                yield from self.do_station("TCN", pr)
-
-        elif group == "TCN_V":
-            # SSS nur wenn enabled
-            if self.cfg.sss_enabled:
-                yield from self.do_station("SSS", pr)
-            if not self.eu_manual_waiting():
-                yield from self.do_station("EU", pr, eu_priority=1)
-            else:
-                yield from self.do_station("TCN", pr)
 
-        pr.exit_min = float(self.env.now)
-        pr.system_min = pr.exit_min - pr.arrival_min
-        self.results.append(pr)
-        if len(self.results) == self.expected_passengers and not self.all_passengers_done.triggered:
-            self.all_passengers_done.succeed()
+        # Besuchte Stationen als Tupel (Station, Wartezeit, Servicezeit); das
+        # Ergebnis wird erst beim Verlassen in die Spalten geschrieben.
+        visits = yield from self._routes[group](group)
+
+        results = self.results
+        results.append(flight_code, pax_id, group, transport_code, arrival, float(self.env.now), visits)
+        if len(results) == self.expected_passengers and not self.all_passengers_done.triggered:
+            self.all_passengers_done.succeed()
+
+    # Routen: geben die besuchten Stationen als Tupel (Station, Wartezeit, Servicezeit) zurück
+    def _route_easypass(self, group: int):
+        wait, serv = yield from self._do_easypass()
+        return ((STATION_EASYPASS, wait, serv),)
+
+    def _route_eu(self, group: int):
+        wait, serv = yield from self._do_eu(0)
+        return ((STATION_EU, wait, serv),)
+
+    def _route_tcn(self, group: int):
+        wait, serv = yield from self._do_tcn(group)
+        return ((STATION_TCN, wait, serv),)
+
+    def _route_none(self, group: int):
+        # Unbekanntes TCN-AT-Ziel: keine Station
+        return ()
+        yield
+
+    def _route_tcn_v(self, group: int):
+        # SSS nur wenn enabled
+        visits = ()
+        if self.cfg.sss_enabled:
+            wait, serv = yield from self._do_sss()
+            visits = ((STATION_SSS, wait, serv),)
+        if not self.eu_manual_waiting():
+            wait, serv = yield from self._do_eu(1)
+            visits += ((STATION_EU, wait, serv),)
+        else:
+            wait, serv = yield from self._do_tcn(group)
+            visits += ((STATION_TCN, wait, serv),)
+        return visits
 
     def control_summary(self) -> dict:
         """
@@ -610,38 +861,36 @@ class BorderControlModel:
             pro Flug und ein Soll-Ist-Vergleich des Passagiermixes.
         """
 
-        total = len(self.results)
-
-        # 1) counts je Gruppe
-        c_group = Counter(r.group for r in self.results)
-
-        # 3) counts je Flug
-        c_flight = Counter(r.flight_key for r in self.results)
-
-        def pct(n: int) -> float:
-            return (100.0 * n / total) if total else 0.0
-
-        # Tabellarisch (als List[dict]) – super für Streamlit/Plotly/CSV
+        res = self.results
+        total = len(res)
+
+        # 1) counts je Gruppe (feste Reihenfolge wie GROUPS)
+        group_counts = np.bincount(res.group_code[:total], minlength=len(GROUPS)).tolist()
+
+        # 3) counts je Flug (nur Flüge mit mindestens einem Passagier)
+        c_flight: Dict[str, int] = defaultdict(int)
+        flight_codes, flight_counts = np.unique(res.flight_code[:total], return_counts=True)
+        for c, n in zip(flight_codes.tolist(), flight_counts.tolist()):
+            c_flight[res.flights[c][0]] += n
+
+        # Tabellarisch (als List[dict]) – super für Streamlit/Plotly/CSV.
+        # Beide Tabellen in einem Durchlauf; Soll/Ist-Vergleich gegen cfg-Mix (nur Gruppen, nicht EES)
+        target = (
+            self.cfg.share_easypass,
+            self.cfg.share_eu_manual,
+            self.cfg.share_tcn_at,
+            self.cfg.share_tcn_v,
+        )
         table_by_group = []
-        for g, n in sorted(c_group.items(), key=lambda x: (-x[1], x[0])):
-            table_by_group.append({
-                "group": g,
-                "count": n,
-                "share_pct": round(pct(n), 1),
-            })
-
-        # Optional: Soll/Ist Vergleich gegen cfg-Mix (nur Gruppen, nicht EES)
-        target = {
-            "EASYPASS": self.cfg.share_easypass,
-            "EU_MANUAL": self.cfg.share_eu_manual,
-            "TCN_AT": self.cfg.share_tcn_at,
-            "TCN_V": self.cfg.share_tcn_v,
-        }
         table_mix_check = []
-        for g in ["EASYPASS", "EU_MANUAL", "TCN_AT", "TCN_V"]:
-            n = c_group.get(g, 0)
+        for g, n, soll in zip(GROUPS, group_counts, target):
             ist = (n / total) if total else 0.0
-            soll = target.get(g, 0.0)
+            if n:
+                table_by_group.append({
+                    "group": g,
+                    "count": n,
+                    "share_pct": round(100.0 * ist, 1),
+                })
             table_mix_check.append({
                 "group": g,
                 "count": n,
@@ -649,6 +898,7 @@ class BorderControlModel:
                 "soll_pct": round(100.0 * soll, 1),
                 "diff_pct_points": round(100.0 * (ist - soll), 1),
             })
+        table_by_group.sort(key=lambda row: -row["count"])
 
         return {
             "total": total,
@@ -662,69 +912,95 @@ class BorderControlModel:
 # =========================================================
 # Generatoren für Flüge und Passagiere
 # =========================================================
-def assign_groups(cfg: SimConfig, rng: random.Random, n: int) -> List[str]:
+@lru_cache(maxsize=32)
+def _group_probabilities(weights: Tuple[float, ...]) -> np.ndarray:
+    """Normiert die Gruppenanteile auf Wahrscheinlichkeiten (gecacht je Mix)."""
+    p = np.asarray(weights, dtype=np.float64)
+    total = p.sum()
+    if total <= 0:
+        raise ValueError("Total of weights must be greater than zero")
+    p = p / total
+    p.flags.writeable = False
+    return p
+
+
+def assign_groups(cfg: SimConfig, rng: np.random.Generator, n: int) -> np.ndarray:
     """
-    Weist `n` Passagieren zufällig eine Gruppe basierend auf dem konfigurierten Mix zu.
+    Weist `n` Passagieren zufällig einen Gruppencode (Index in `GROUPS`)
+    basierend auf dem konfigurierten Mix zu.
     """
-    weights = [
+    weights = (
         cfg.share_easypass,
         cfg.share_eu_manual,
         cfg.share_tcn_at,
         cfg.share_tcn_v,
-    ]
-    return rng.choices(GROUPS, weights=weights, k=n)
+    )
+    return rng.choice(len(GROUPS), size=n, p=_group_probabilities(weights)).astype(np.int8)
 
 
 def schedule_flights(env: simpy.Environment, model: BorderControlModel, flights: List[Dict[str, Any]]):
     """
     Plant die Ankunft aller Flüge und ihrer Passagiere in der Simulation.
 
-    Für jeden Flug wird ein eigener `simpy`-Prozess (`flight_proc`) gestartet,
-    der wiederum die Ankunft der einzelnen Passagiere dieses Fluges plant.
+    Für jeden Flug wird ein eigener `simpy`-Prozess (`flight_proc`) gestartet.
+    Dieser berechnet die Ankunftszeiten aller Passagiere des Fluges vorab,
+    sortiert sie und startet die Passagierprozesse nacheinander zum jeweiligen
+    Zeitpunkt – ohne eigenen Warte-Prozess pro Passagier.
     """
     
-    def flight_proc(f: Dict[str, Any]):
+    def flight_proc(f: Dict[str, Any], ppos: str, distance_m: float):
         # Warten bis SIBT (relativ)
         yield env.timeout(max(0.0, f["t_arr_min"] - env.now))
+        t_flight = env.now
+
+        # Häufig genutzte Attribute einmal pro Flug binden (Hot Loop)
+        cfg = model.cfg
+        np_rng = model.np_rng
+        walk_pool = model.normal_pools["WALK"]
+        process = env.process
+        timeout = env.timeout
+        passenger_process = model.passenger_process
+        deboard_offset_min = cfg.deboard_offset_min
+        deboard_min_s = cfg.deboard_delay_min_s
+        deboard_max_s = cfg.deboard_delay_max_s
 
         pax = int(f["spax"])
-        groups = assign_groups(model.cfg, model.rng, pax)
+        if pax <= 0:
+            return
+        groups = assign_groups(cfg, np_rng, pax).tolist()
 
-        # Distanz einmal pro Flug bestimmen (PPOS -> Border)
-        distance_m = float(PPOS_DISTANCE_M.get(str(f["ppos"]), 0.0))
-        ppos = str(f["ppos"])
+        flight_code = model.results.intern_flight(f["flight_key"], f["fln"], ppos)
 
         if distance_m > 0:
             # Passagiere gehen zu Fuß (sequenzielles Deboarding)
-            transport_mode = "Walk"
-            
-            # Kumulativer Deboarding-Delay, startet mit dem Offset
-            cumulative_deboard_delay_min = model.cfg.deboard_offset_min
-            
-            for i, g in enumerate(groups, start=1):
-                # Addiere die Verzögerung zwischen Passagieren (außer für den ersten)
-                if i > 1:
-                    inter_pax_delay_s = model.rng.randint(
-                        model.cfg.deboard_delay_min_s,
-                        model.cfg.deboard_delay_max_s
-                    )
-                    cumulative_deboard_delay_min += inter_pax_delay_s / 60.0
-
-                walk_delay = _walk_time_min(model.cfg, model.rng, distance_m)
-                
-                total_delay = cumulative_deboard_delay_min + walk_delay
-                env.process(spawn_after(total_delay, f["flight_key"], f["fln"], ppos, i, g, transport_mode))
+            transport_code = TRANSPORT_WALK
+
+            # Kumulativer Deboarding-Delay, startet mit dem Offset; der erste
+            # Passagier hat keine Verzögerung zum Vorgänger. Ganze Sekunden
+            # zwischen min und max (inklusive), für alle Passagiere auf einmal.
+            inter_pax_delay_s = np.zeros(pax, dtype=np.int64)
+            inter_pax_delay_s[1:] = np_rng.integers(deboard_min_s, deboard_max_s, size=pax - 1, endpoint=True)
+            deboard_delay_min = deboard_offset_min + np.cumsum(inter_pax_delay_s) / 60.0
+
+            walk_delay = _walk_times_min(cfg, walk_pool, distance_m, pax)
+
+            delays = deboard_delay_min + walk_delay
+            # Überholen auf dem Weg ist möglich -> nach Ankunft an der Grenze sortieren
+            order = np.argsort(delays, kind="stable")
+            delays = delays[order].tolist()
+            pax_idx = order.tolist()
         else:
             # Passagiere werden mit dem Bus gefahren
-            transport_mode = "Bus"
-            bus_capacity = model.cfg.bus_capacity
-            bus_fill_time_max_min = model.cfg.bus_fill_time_min
-            bus_travel_time = model.cfg.bus_travel_time_min
+            transport_code = TRANSPORT_BUS
+            bus_capacity = cfg.bus_capacity
+            bus_fill_time_max_min = cfg.bus_fill_time_min
+            bus_travel_time = cfg.bus_travel_time_min
 
             num_buses = math.ceil(pax / bus_capacity)
             # Die Füllzeit des ersten Busses beginnt nach dem initialen Offset
-            last_bus_departure_time_min = model.cfg.deboard_offset_min
+            last_bus_departure_time_min = deboard_offset_min
 
+            delays = []
             for bus_idx in range(num_buses):
                 start_pax_idx = bus_idx * bus_capacity
                 end_pax_idx = min((bus_idx + 1) * bus_capacity, pax)
@@ -736,25 +1012,26 @@ def schedule_flights(env: simpy.Environment, model: BorderControlModel, flights:
                 # Abfahrtszeit des Busses = Abfahrt des letzten Busses + Füllzeit des aktuellen.
                 current_bus_departure_time_min = last_bus_departure_time_min + current_bus_fill_time
                 
-                # Ankunftszeit an der Grenzkontrolle.
+                # Ankunftszeit an der Grenzkontrolle; alle Passagiere dieses Busses kommen als Bulk an.
                 bus_arrival_at_border_min = current_bus_departure_time_min + bus_travel_time
-
-                # Alle Passagiere dieses Busses schedulen, sie kommen als Bulk an.
-                for i in range(start_pax_idx, end_pax_idx):
-                    g = groups[i]
-                    pax_id = i + 1
-                    
-                    env.process(spawn_after(bus_arrival_at_border_min, f["flight_key"], f["fln"], ppos, pax_id, g, transport_mode))
+                delays.extend([bus_arrival_at_border_min] * pax_in_this_bus)
 
                 # Abfahrtszeit für die nächste Iteration (Bus) aktualisieren.
                 last_bus_departure_time_min = current_bus_departure_time_min
+            pax_idx = range(pax)
 
-    def spawn_after(delay: float, flight_key: str, fln: str, ppos: str, pax_id: int, group: str, transport_mode: str):
-        yield env.timeout(delay)
-        env.process(model.passenger_process(flight_key, fln, ppos, pax_id, group, transport_mode))
+        # Passagierprozesse in Ankunftsreihenfolge starten
+        for delay, i in zip(delays, pax_idx):
+            t_arrival = t_flight + delay
+            now = env.now
+            if t_arrival > now:
+                yield timeout(t_arrival - now)
+            process(passenger_process(flight_code, i + 1, groups[i], transport_code))
 
+    # PPOS und Distanz (PPOS -> Border) vorab je Flug auflösen
     for f in flights:
-        env.process(flight_proc(f))
+        ppos = str(f["ppos"])
+        env.process(flight_proc(f, ppos, float(PPOS_DISTANCE_M.get(ppos, 0.0))))
 
 
 
@@ -793,3 +1070,74 @@ def run_simulation(
     else:
         env.run(until=until_min)
     return model
+
+
+def _run_replicate(
+    seed: int,
+    flights: List[Dict[str, Any]],
+    cfg: SimConfig,
+    t0: pd.Timestamp,
+    until_min: Optional[float],
+) -> tuple[PassengerResults, QueueSnapshots]:
+    """Führt einen Lauf aus und gibt nur die picklebaren Ergebnisse zurück (kein simpy-Modell)."""
+    model = run_simulation(flights, cfg, t0, seed=seed, until_min=until_min)
+    return model.results, model.queue_ts
+
+
+def simulation_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Erzeugt einen Prozesspool für `run_simulations`.
+
+    Die Worker werden per "spawn" als frische Interpreter gestartet statt per
+    "fork" kopiert. Sie erben damit weder Threads noch Locks des (mehrfädigen)
+    Streamlit-Prozesses. Beim Start führen sie den Bootstrap des Hauptmoduls
+    erneut aus und importieren dieses Modul samt Abhängigkeiten (pandas, simpy),
+    was pro Worker rund eine Sekunde kostet; der Pool sollte daher für mehrere
+    Läufe wiederverwendet werden.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_simulations(
+    jobs: List[tuple[List[Dict[str, Any]], SimConfig, int]],
+    t0: pd.Timestamp,
+    until_min: Optional[float] = None,
+    executor: Optional[Executor] = None,
+    n_workers: Optional[int] = None,
+) -> List[tuple[PassengerResults, QueueSnapshots]]:
+    """
+    Führt unabhängige Simulationsläufe parallel aus.
+
+    Ein Job ist ein Tupel (flights, cfg, seed), z.B. mehrere Seeds desselben
+    Szenarios oder die Läufe für T1 und T2. Jeder Job wird in einem eigenen
+    Prozess simuliert. Zurückgegeben werden nur die Ergebnisse und
+    Warteschlangen-Zeitreihen, da das `simpy`-Modell selbst nicht zwischen
+    Prozessen übertragen werden kann.
+
+    Args:
+        jobs: Liste von (flights, cfg, seed)-Tupeln, je ein Lauf.
+        t0: Der absolute Startzeitpunkt der Simulation (t=0).
+        until_min: Die maximale Simulationsdauer in Minuten.
+        executor: Optionaler, wiederverwendbarer Pool (siehe `simulation_executor`);
+            ohne Pool wird für den Aufruf ein eigener "spawn"-Pool erzeugt.
+        n_workers: Anzahl paralleler Prozesse (None = Anzahl CPU-Kerne), wenn
+            kein `executor` übergeben wird; 1 = nacheinander im aktuellen Prozess.
+
+    Returns:
+        Eine Liste von Tupeln (results, queue_ts) in der Reihenfolge von `jobs`.
+    """
+    if len(jobs) <= 1 or (executor is None and n_workers == 1):
+        return [_run_replicate(seed, flights, cfg, t0, until_min) for flights, cfg, seed in jobs]
+
+    if executor is None:
+        with simulation_executor(max_workers=n_workers) as executor:
+            return run_simulations(jobs, t0, until_min=until_min, executor=executor)
+
+    # Schwerste Läufe (meiste Passagiere) zuerst einreihen, damit sie nicht am
+    # Ende allein laufen; Ergebnisse in der ursprünglichen Reihenfolge zurückgeben.
+    order = sorted(range(len(jobs)), key=lambda j: -sum(int(f["spax"]) for f in jobs[j][0]))
+    futures = {}
+    for j in order:
+        flights, cfg, seed = jobs[j]
+        futures[j] = executor.submit(_run_replicate, seed, flights, cfg, t0, until_min)
+    return [futures[j].result() for j in range(len(jobs))]
@@ -120,27 +120,13 @@ PPOS_DISTANCE_M = {
     "07A": 240.0,
     "07B": 220.0,
     "08": 290.0,
-    
-    # Falls PPOS ohne führende Null kommt:
-    "1": 165.0,
-    "1A": 200.0,
-    "1B": 165.0,
-    "2": 110.0,
-    "2A": 110.0,
-    "2B": 70.0,
-    "5": 110.0,
-    "5A": 110.0,
-    "5B": 70.0,
-    "6": 120.0,
-    "6A": 150.0,
-    "6B": 120.0,
-    "7": 240.0,
-    "7A": 240.0,
-    "7B": 220.0,
-    "8": 290.0,
 }
 
 AVG_PPOS_DISTANCE_M = sum(PPOS_DISTANCE_M.values()) / len(PPOS_DISTANCE_M)
+
+# Falls PPOS ohne führende Null kommt: Aliase aus den kanonischen Einträgen ableiten
+PPOS_DISTANCE_M.update({k.lstrip("0"): v for k, v in list(PPOS_DISTANCE_M.items())})
+
 API_TERMINAL_PPOS = {
     1: "API_T1",
     2: "API_T2",
@@ -5,6 +5,9 @@ Dieses Modul enthält Funktionen zur Erstellung verschiedener Diagramme
 mittels Plotly, wie z.B. Zeitreihen, Heatmaps und Balkendiagramme,
 um die Simulationsergebnisse zu visualisieren.
 """
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -15,9 +18,47 @@ if TYPE_CHECKING:
     from engine import SimConfig
 
 
-def _to_time_axis(t0: pd.Timestamp, t_min_series: pd.Series) -> pd.Series:
-    """Konvertiert eine Serie von relativen Minuten in absolute Zeitstempel."""
-    return t0 + pd.to_timedelta(t_min_series, unit="m")
+def _to_time_axis(t0: pd.Timestamp, t_min_series: pd.Series) -> pd.DatetimeIndex:
+    """Konvertiert eine Serie von relativen Minuten in absolute Zeitstempel.
+
+    Rechnet direkt auf int64-Nanosekunden statt über `pd.to_timedelta`;
+    NaN-Werte werden zu NaT.
+    """
+    t0 = pd.Timestamp(t0)
+    minutes = np.asarray(t_min_series, dtype=np.float64)
+    nan_mask = np.isnan(minutes)
+    ns = np.rint(np.where(nan_mask, 0.0, minutes) * 60e9).astype(np.int64) + t0.value
+    ns[nan_mask] = pd.NaT.value
+    axis = pd.DatetimeIndex(ns.view("datetime64[ns]"))
+    if t0.tz is not None:
+        axis = axis.tz_localize("UTC").tz_convert(t0.tz)
+    return axis
+
+
+_NS_PER_MIN = 60 * 1_000_000_000
+
+
+@lru_cache(maxsize=16)
+def _fixed_day_window(t0: pd.Timestamp) -> tuple:
+    """
+    Fester Darstellungsbereich 06:00 bis 24:00 Uhr am Tag von t0 (gecacht je t0).
+
+    Returns:
+        Tupel (t_start_fixed, t_end_fixed, min_rel_start, min_rel_end) mit den Grenzen
+        als Zeitstempel und in Minuten relativ zu t0.
+    """
+    day_start_ns = t0.normalize().value
+    start_ns = day_start_ns + 6 * 60 * _NS_PER_MIN
+    end_ns = day_start_ns + 24 * 60 * _NS_PER_MIN
+    t_start_fixed = pd.Timestamp(start_ns, tz=t0.tz)
+    t_end_fixed = pd.Timestamp(end_ns, tz=t0.tz)
+    return t_start_fixed, t_end_fixed, (start_ns - t0.value) / _NS_PER_MIN, (end_ns - t0.value) / _NS_PER_MIN
+
+
+@lru_cache(maxsize=64)
+def _time_axis_for_range(t0: pd.Timestamp, start: int, stop: int, step: int) -> pd.DatetimeIndex:
+    """Zeitachse für ein ganzzahliges Minutenraster `range(start, stop, step)` (gecacht)."""
+    return _to_time_axis(t0, np.arange(start, stop, step, dtype=np.float64))
 
 # =========================================================
 # Farbdefinitionen für Diagramme
@@ -29,6 +70,12 @@ STATION_COLORS = {
     "TCN": "#94C11C",          # Grün
 }
 
+# Linienstile je Station, einmalig vorberechnet (Warteschlange bzw. Wartezeit)
+_QUEUE_LINES = {label: dict(color=color, width=2.5) for label, color in STATION_COLORS.items()}
+_QUEUE_LINE_DEFAULT = dict(color="black", width=2.5)
+_WAIT_LINES = {label: dict(color=color, width=2.75) for label, color in STATION_COLORS.items()}
+_WAIT_LINE_DEFAULT = dict(color="black", width=2.75)
+
 SERVICE_LEVEL_COLOR = "#d62728"  # Rot
 CAPACITY_BAR_COLOR = "#a8a9ac"      # Grau
 
@@ -53,45 +100,35 @@ HEATMAP_COLORS = [
     '#EF7C00',  # > 45 min
 ]
 
+@lru_cache(maxsize=32)
+def _discrete_colorscale(bounds: tuple, colors: tuple, zmax_val: float) -> tuple:
+    """
+    Baut eine diskrete Plotly-Farbskala aus Klassengrenzen (gecacht je Parametersatz).
+
+    Jede Farbe `colors[i]` gilt zwischen `bounds[i-1]` und `bounds[i]`
+    (die erste ab 0, die letzte bis `zmax_val`).
+    """
+    stops = (0.0,) + tuple(b / zmax_val for b in bounds) + (1.0,)
+    scale = []
+    for i, color in enumerate(colors):
+        scale.append((stops[i], color))
+        scale.append((stops[i + 1], color))
+    return tuple(scale)
+
+
+# Klassengrenzen: Warteschlange in Pax (<= 10, 11-25, 26-50, 51-100, > 100)
+_QUEUE_HEATMAP_BOUNDS = (10, 25, 50, 100)
+# Klassengrenzen: Wartezeit in Minuten (<= 10, 11-20, 21-30, 31-45, > 45)
+_HEATMAP_BOUNDS = (10, 20, 30, 45)
+
+
 def get_queue_heatmap_colorscale(zmax_val: float = 150.0) -> list:
     """Erstellt eine diskrete Farbskala für die Heatmap der Warteschlangenlänge."""
-    return [
-        # Range 1: <= 10 pax
-        [0.0, QUEUE_HEATMAP_COLORS[0]],
-        [10/zmax_val, QUEUE_HEATMAP_COLORS[0]],
-        # Range 2: > 10 to <= 25 pax
-        [10/zmax_val, QUEUE_HEATMAP_COLORS[1]],
-        [25/zmax_val, QUEUE_HEATMAP_COLORS[1]],
-        # Range 3: > 25 to <= 50 pax
-        [25/zmax_val, QUEUE_HEATMAP_COLORS[2]],
-        [50/zmax_val, QUEUE_HEATMAP_COLORS[2]],
-        # Range 4: > 50 to <= 100 pax
-        [50/zmax_val, QUEUE_HEATMAP_COLORS[3]],
-        [100/zmax_val, QUEUE_HEATMAP_COLORS[3]],
-        # Range 5: > 100 pax
-        [100/zmax_val, QUEUE_HEATMAP_COLORS[4]],
-        [1.0, QUEUE_HEATMAP_COLORS[4]],
-    ]
+    return list(_discrete_colorscale(_QUEUE_HEATMAP_BOUNDS, tuple(QUEUE_HEATMAP_COLORS), float(zmax_val)))
 
 def get_heatmap_colorscale(zmax_val: float = 60.0) -> list:
     """Erstellt eine diskrete Farbskala für die Heatmap der Wartezeit."""
-    return [
-        # Range 1: <= 10 min
-        [0.0, HEATMAP_COLORS[0]],
-        [10/zmax_val, HEATMAP_COLORS[0]],
-        # Range 2: > 10 to <= 20 min
-        [10/zmax_val, HEATMAP_COLORS[1]],
-        [20/zmax_val, HEATMAP_COLORS[1]],
-        # Range 3: > 20 to <= 30 min
-        [20/zmax_val, HEATMAP_COLORS[2]],
-        [30/zmax_val, HEATMAP_COLORS[2]],
-        # Range 4: > 30 to <= 45 min
-        [30/zmax_val, HEATMAP_COLORS[3]],
-        [45/zmax_val, HEATMAP_COLORS[3]],
-        # Range 5: > 45 min
-        [45/zmax_val, HEATMAP_COLORS[4]],
-        [1.0, HEATMAP_COLORS[4]],
-    ]
+    return list(_discrete_colorscale(_HEATMAP_BOUNDS, tuple(HEATMAP_COLORS), float(zmax_val)))
 
 # =========================================================
 # Datenaufbereitungs-Funktionen für Diagramme
@@ -108,15 +145,16 @@ def _build_rolling_mean_timeseries(
     """
     Berechnet einen gleitenden Mittelwert über eine Zeitreihe auf einem festen Zeitraster.
 
-    Diese Funktion verwendet einen effizienten Zwei-Zeiger-Algorithmus, um den
-    gleitenden Mittelwert einer Wertespalte über ein definiertes Zeitfenster zu
-    berechnen. Die Berechnung erfolgt auf einem festen Zeitraster von 06:00 bis 24:00 Uhr
+    Diese Funktion bestimmt die Fenstergrenzen je Rasterpunkt per `np.searchsorted`
+    und die Fenstersummen über Präfixsummen, um den gleitenden Mittelwert einer
+    Wertespalte über ein definiertes Zeitfenster vektorisiert zu berechnen. Die
+    Berechnung erfolgt auf einem festen Zeitraster von 06:00 bis 24:00 Uhr
     am Tag des Simulationsstarts (t0).
 
     Hinweis: Diese manuelle Implementierung wird anstelle einer direkten
     `pandas.DataFrame.rolling`-Operation verwendet, da der Mittelwert nicht für jeden
     Datenpunkt, sondern auf einem separaten, festen Zeitraster (`grid`) ausgewertet
-    werden soll. Der Zwei-Zeiger-Ansatz ist hierfür mit einer Komplexität von O(N+M) sehr effizient.
+    werden soll. Der Aufwand liegt bei O(N + M log N) ohne Python-Schleife.
 
     Args:
         df_data: DataFrame mit den Zeit- und Wertedaten.
@@ -131,45 +169,58 @@ def _build_rolling_mean_timeseries(
         Ein DataFrame mit den Spalten 't_min' (Zeit-Raster) und 'mean_value'
         (berechneter gleitender Mittelwert).
     """
-    df = df_data[[time_col, value_col]].dropna().sort_values(time_col)
-
-    # Define fixed time range: 06:00 to 24:00
-    day_start = t0.normalize()
-    t_start_fixed = day_start + pd.Timedelta(hours=6)
-    t_end_fixed = day_start + pd.Timedelta(hours=24)
-    min_rel_start = (t_start_fixed - t0).total_seconds() / 60.0
-    min_rel_end = (t_end_fixed - t0).total_seconds() / 60.0
+    return _rolling_mean_on_grid(
+        df_data[time_col].to_numpy(dtype=np.float64),
+        df_data[value_col].to_numpy(dtype=np.float64),
+        t0,
+        window_min=window_min,
+        step_min=step_min,
+    )
 
-    t_start = min_rel_start
-    t_end = min_rel_end
 
-    grid = pd.DataFrame({
-        "t_min": [t_start + i * step_min for i in range(int((t_end - t_start) / step_min) + 1)]
-    })
+def _rolling_mean_on_grid(
+    t_vals: np.ndarray,
+    val_vals: np.ndarray,
+    t0: pd.Timestamp,
+    window_min: int = 15,
+    step_min: int = 1,
+) -> pd.DataFrame:
+    """
+    Array-Variante von `_build_rolling_mean_timeseries` für Aufrufer, die Zeit- und
+    Wertespalten bereits als float64-Arrays vorliegen haben (ohne DataFrame-Umweg).
+    """
+    valid = ~(np.isnan(t_vals) | np.isnan(val_vals))
+    if not valid.all():
+        t_vals = t_vals[valid]
+        val_vals = val_vals[valid]
+    # Die Simulation liefert meist bereits chronologisch sortierte Daten
+    if t_vals.size > 1 and not (t_vals[1:] >= t_vals[:-1]).all():
+        order = np.argsort(t_vals, kind="stable")
+        t_vals = t_vals[order]
+        val_vals = val_vals[order]
 
-    if df.empty:
-        grid["mean_value"] = 0.0
-        return grid
+    # Define fixed time range: 06:00 to 24:00
+    _, _, t_start, t_end = _fixed_day_window(t0)
 
-    t_vals = df[time_col].to_numpy()
-    val_vals = df[value_col].to_numpy()
-    n = len(df)
+    grid_arr = t_start + np.arange(int((t_end - t_start) / step_min) + 1) * step_min
 
-    means = []
-    left = 0
-    right = 0
+    n = t_vals.size
+    if n == 0:
+        return pd.DataFrame({"t_min": grid_arr, "mean_value": 0.0})
 
-    for t in grid["t_min"].to_numpy():
-        while right < n and t_vals[right] <= t:
-            right += 1
-        while left < n and t_vals[left] < t - window_min:
-            left += 1
-        means.append(val_vals[left:right].mean() if right > left else 0.0)
+    # Fenstergrenzen je Rasterpunkt per Binärsuche, Summen über Präfixsummen
+    right = np.searchsorted(t_vals, grid_arr, side="right")
+    left = np.searchsorted(t_vals, grid_arr - window_min, side="left")
+    cs = np.empty(n + 1)
+    cs[0] = 0.0
+    np.cumsum(val_vals, out=cs[1:])
+    counts = right - left
+    means = np.where(counts > 0, (cs[right] - cs[left]) / np.maximum(counts, 1), 0.0)
 
-    grid["mean_value"] = means
-    return grid
+    return pd.DataFrame({"t_min": grid_arr, "mean_value": means})
 
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def build_queue_timeseries_rolling(
     df_ts: pd.DataFrame,
     t0: pd.Timestamp,
@@ -212,13 +263,19 @@ def plot_queue_over_time_rolling(
         window_min: Fenstergröße für die Darstellung (nur im Titel verwendet).
         y_max: Optionaler Maximalwert für die Y-Achse.
     """
-    fig = go.Figure()
-
+    # Alle Stationen teilen in der Regel dasselbe Raster: Zeitachse nur bei Abweichung neu bauen
+    traces = []
+    x, x_t_min = None, None
     for ts, label in list_of_ts_data:
         if ts.empty:
             continue
-        x = _to_time_axis(t0, ts["t_min"])
-        fig.add_trace(go.Scatter(x=x, y=ts["mean_q"], mode="lines", name=label, line=dict(color=STATION_COLORS.get(label, "black"), width=2.5)))
+        t_min = ts["t_min"].to_numpy()
+        if x is None or not np.array_equal(t_min, x_t_min):
+            x, x_t_min = _to_time_axis(t0, t_min), t_min
+        traces.append(go.Scattergl(x=x, y=ts["mean_q"], mode="lines", name=label, line=_QUEUE_LINES.get(label, _QUEUE_LINE_DEFAULT)))
+
+    # Figure in einem Schritt mit allen Traces aufbauen statt add_trace je Station
+    fig = go.Figure(data=traces)
 
     fig.update_layout(
         xaxis_title=None,
@@ -240,6 +297,7 @@ def plot_queue_over_time_rolling(
     st.plotly_chart(fig, width="stretch")
 
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def build_wait_time_timeseries_rolling(
     df_res: pd.DataFrame,
     t0: pd.Timestamp,
@@ -263,25 +321,21 @@ def build_wait_time_timeseries_rolling(
     wait_col = f"wait_{station}"
     serv_col = f"serv_{station}"
 
-    df_filtered = df_res[df_res[serv_col] > 0].copy()
-    
-    if df_filtered.empty:
-        # Pass an empty dataframe to the helper to get a zero-filled grid
-        df_prepared = pd.DataFrame(columns=["service_start_time", wait_col])
-    else:
-        df_filtered["service_start_time"] = df_filtered["arrival_min"] + df_filtered[wait_col]
-        df_prepared = df_filtered
+    # Nur die benötigten Spalten als Arrays, ohne DataFrame-Kopie
+    mask = df_res[serv_col].to_numpy() > 0
+    wait_vals = df_res[wait_col].to_numpy(dtype=np.float64)[mask]
+    service_start_time = df_res["arrival_min"].to_numpy(dtype=np.float64)[mask] + wait_vals
 
-    grid = _build_rolling_mean_timeseries(
-        df_data=df_prepared,
-        t0=t0,
-        time_col="service_start_time",
-        value_col=wait_col,
+    grid = _rolling_mean_on_grid(
+        service_start_time,
+        wait_vals,
+        t0,
         window_min=window_min,
         step_min=step_min,
     )
     return grid.rename(columns={"mean_value": "mean_wait"})
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def build_wait_time_timeseries_by_group_rolling(
     df_res: pd.DataFrame,
     t0: pd.Timestamp,
@@ -304,13 +358,8 @@ def build_wait_time_timeseries_by_group_rolling(
         window_min: Größe des Fensters in Minuten.
         step_min: Schrittweite des Zeitrasters in Minuten.
     """
-    df_filtered = df_res[df_res["group"].isin(groups)].copy()
-    
-    if df_filtered.empty:
-        # Pass an empty dataframe to the helper to get a zero-filled grid
-        df_prepared = pd.DataFrame(columns=["arrival_min", value_col])
-    else:
-        df_prepared = df_filtered
+    # Nur Ankunftszeit und Wertespalte der Gruppe auswählen, ohne Kopie des gesamten Frames
+    df_prepared = df_res.loc[df_res["group"].isin(groups), ["arrival_min", value_col]]
 
     grid = _build_rolling_mean_timeseries(
         df_data=df_prepared,
@@ -322,6 +371,30 @@ def build_wait_time_timeseries_by_group_rolling(
     )
     return grid.rename(columns={"mean_value": "mean_wait"})
 
+@lru_cache(maxsize=8)
+def _schedule_bar_points(schedule_items: tuple) -> tuple:
+    """
+    Zerlegt einen Kapazitätsplan in nach Startzeit sortierte Stützpunkte (gecacht).
+
+    Args:
+        schedule_items: `tuple(schedule.items())` mit Schlüsseln wie "06:00-06:15".
+
+    Returns:
+        Tupel (Startminuten ab Tagesbeginn, Kapazitäten), beide nach Startzeit sortiert.
+    """
+    points = []
+    for key, cap in schedule_items:
+        start_str, _ = key.split('-')
+        if ':' in start_str:
+            start_h, start_m = map(int, start_str.split(':'))
+        else:
+            start_h = int(start_str)
+            start_m = 0
+        points.append((start_h * 60 + start_m, cap))
+    points.sort()
+    return tuple(p[0] for p in points), tuple(p[1] for p in points)
+
+
 def plot_mean_wait_over_time_rolling(
     list_of_ts_data: list,
     t0: pd.Timestamp,
@@ -367,23 +440,13 @@ def plot_mean_wait_over_time_rolling(
         day_start = t0.normalize()
 
         if schedule:
-            points = []
-            for key, cap in schedule.items():
-                start_str, _ = key.split('-')
-                if ':' in start_str:
-                    start_h, start_m = map(int, start_str.split(':'))
-                else:
-                    start_h = int(start_str)
-                    start_m = 0
-                points.append((pd.Timedelta(hours=start_h, minutes=start_m), cap))
-            points.sort()
+            start_min, bar_caps = _schedule_bar_points(tuple(schedule.items()))
 
             interval_duration_min = 15  # Annahme: 15-Minuten-Intervalle
-            center_offset = pd.Timedelta(minutes=interval_duration_min / 2)
             bar_width_ms = (interval_duration_min * 60 * 1000) * 0.9 # 90% der Intervallbreite für eine Lücke
 
-            bar_centers = [day_start + time_delta + center_offset for time_delta, _ in points]
-            bar_caps = [cap for _, cap in points]
+            bar_centers = _to_time_axis(day_start, np.asarray(start_min) + interval_duration_min / 2)
+            bar_caps = list(bar_caps)
 
             fig.add_trace(
                 go.Bar(
@@ -399,18 +462,26 @@ def plot_mean_wait_over_time_rolling(
             )
 
     max_wait_from_data = 0
+    # Alle Stationen teilen in der Regel dasselbe Raster: Zeitachse nur bei Abweichung neu bauen
+    traces = []
+    x, x_t_min = None, None
     for ts, label in list_of_ts_data:
         if ts.empty:
             continue
-        if not ts['mean_wait'].empty:
-            max_wait_from_data = max(max_wait_from_data, ts['mean_wait'].max())
+        y = ts["mean_wait"].to_numpy()
+        max_wait_from_data = max(max_wait_from_data, np.nanmax(y))
+
+        t_min = ts["t_min"].to_numpy()
+        if x is None or not np.array_equal(t_min, x_t_min):
+            x, x_t_min = _to_time_axis(t0, t_min), t_min
+        traces.append(go.Scattergl(x=x, y=y, mode="lines", name=label, opacity=1.0, line=_WAIT_LINES.get(label, _WAIT_LINE_DEFAULT)))
 
-        x = _to_time_axis(t0, ts["t_min"])
-        trace = go.Scatter(x=x, y=ts["mean_wait"], mode="lines", name=label, opacity=1.0, line=dict(color=STATION_COLORS.get(label, "black"), width=2.75))
+    # Alle Linien in einem Aufruf hinzufügen statt add_trace je Station
+    if traces:
         if has_secondary_axis:
-            fig.add_trace(trace, secondary_y=False)
+            fig.add_traces(traces, secondary_ys=[False] * len(traces))
         else:
-            fig.add_trace(trace)
+            fig.add_traces(traces)
 
      # Service-Level-Linie hinzufügen, falls vorhanden
     if cfg and hasattr(cfg, 'service_level_min'):
@@ -482,6 +553,7 @@ def plot_mean_wait_over_time_rolling(
     st.plotly_chart(fig, width="stretch")
 
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def _get_queue_heatmap_traces(
     df_ts: pd.DataFrame,
     t0: pd.Timestamp,
@@ -494,7 +566,9 @@ def _get_queue_heatmap_traces(
     Bereitet die Daten für die Heatmap der Warteschlangenlänge vor.
 
     Aggregiert die maximale Warteschlangenlänge pro Zeitintervall (`bin_min`)
-    für jede relevante Station.
+    für jede relevante Station. Grundlage sind die im Raster `queue_snapshot_min`
+    abgetasteten Werte der Engine, d.h. das Maximum über die Abtastpunkte; kurze
+    Spitzen zwischen zwei Abtastungen sind darin nicht enthalten.
 
     Args:
         df_ts: DataFrame mit den Zeitreihendaten der Warteschlangen.
@@ -514,26 +588,40 @@ def _get_queue_heatmap_traces(
     min_rel_end = (t_end_fixed - t0).total_seconds() / 60.0
     start_bin = int((min_rel_start // bin_min) * bin_min)
     end_bin = int((min_rel_end // bin_min) * bin_min)
-    full_idx = range(start_bin, end_bin, bin_min)
-    
+    full_idx = np.arange(start_bin, end_bin, bin_min)
+
+    # Zeilen ohne Zeitstempel (z.B. aus CSV geladener Runs) werden ignoriert
+    t_vals = df_ts["t_min"].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(t_vals)
+    if not valid.any():
+        return [], []
+
+    # Bins einmal sortieren und segmentieren, dann Maxima je Station per reduceat
+    t_bin = (t_vals[valid] // bin_min).astype(np.int64) * bin_min
+    order = np.argsort(t_bin, kind="stable")
+    t_bin_sorted = t_bin[order]
+    starts = np.flatnonzero(np.r_[True, t_bin_sorted[1:] != t_bin_sorted[:-1]])
+    bins = t_bin_sorted[starts]
+    pos = np.minimum(np.searchsorted(bins, full_idx), len(bins) - 1)
+    hit = bins[pos] == full_idx
+
     z_data = {}
-    df_ts_binned = df_ts.copy()
-    df_ts_binned["t_bin"] = (df_ts_binned["t_min"] // bin_min).astype(int) * bin_min
-    
     for label, col_q in stations_map.items():
-        if col_q not in df_ts_binned.columns:
-            z_data[label] = pd.Series(0, index=full_idx)
-            continue
-        grouped = df_ts_binned.groupby("t_bin")[col_q].max()
-        z_data[label] = grouped.reindex(full_idx, fill_value=0)
+        z_row = np.zeros(len(full_idx), dtype=np.int64)
+        if col_q in df_ts.columns:
+            # NaN-Werte wie groupby().max() überspringen (als 0 Pax werten)
+            q_vals = np.nan_to_num(df_ts[col_q].to_numpy(dtype=np.float64)[valid], nan=0.0)
+            bin_max = np.fmax.reduceat(q_vals[order], starts)
+            z_row[hit] = bin_max[pos[hit]]
+        z_data[label] = z_row
     
-    x = _to_time_axis(t0, pd.Series(full_idx))
+    x = _time_axis_for_range(t0, start_bin, end_bin, bin_min)
     ordered_keys = ["Easypass", "EU", "TCN"]
     if show_sss:
         ordered_keys.append("SSS (Kiosk)")
         
-    z = [z_data[k].values for k in ordered_keys]
-    text_z = [[f'{int(val)}' if val > 0 else '' for val in row] for row in z]
+    z = np.vstack([z_data[k] for k in ordered_keys])
+    text_z = np.where(z > 0, np.char.mod('%d', z), '').tolist()
     zmax_val = 150.0
     heatmap_colorscale = get_queue_heatmap_colorscale(zmax_val)
     
@@ -562,9 +650,7 @@ def plot_queue_heatmap(
         terminal: Name des Terminals (für Titel).
         cfg: Die `SimConfig` des Laufs.
     """
-    day_start = t0.normalize()
-    t_start_fixed = day_start + pd.Timedelta(hours=6)
-    t_end_fixed = day_start + pd.Timedelta(hours=24)
+    t_start_fixed, t_end_fixed, _, _ = _fixed_day_window(t0)
 
     fig = go.Figure()
 
@@ -573,8 +659,7 @@ def plot_queue_heatmap(
     )
 
     if heatmap_traces:
-        for trace in heatmap_traces:
-            fig.add_trace(trace)
+        fig.add_traces(heatmap_traces)
         fig.update_yaxes(tickvals=heatmap_y_labels, ticktext=heatmap_y_labels)
     else:
         fig.add_annotation(
@@ -590,6 +675,7 @@ def plot_queue_heatmap(
     )
     st.plotly_chart(fig, width="stretch")
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def _get_wait_heatmap_traces(
     df_res: pd.DataFrame,
     t0: pd.Timestamp,
@@ -633,25 +719,34 @@ def _get_wait_heatmap_traces(
     
     # Range bis end_bin (exklusiv), d.h. letzter Bin startet vor 24:00 (z.B. 23:45)
     full_idx = range(start_bin, end_bin, bin_min)
+    labels = list(stations_map)
+
+    # Bin-Position je Passagier auf dem festen Raster (außerhalb: -1, wird verworfen)
+    n_bins = len(full_idx)
+    bin_code = (df_res["arrival_min"].to_numpy() // bin_min).astype(int) - start_bin // bin_min
+    bin_code[(bin_code < 0) | (bin_code >= n_bins)] = -1
+    # Vergleich statt bool-Cast: NaN (z.B. aus geladenen CSVs) zählt als nicht genutzt
+    used_mat = (df_res[[col_used for col_used, _ in stations_map.values()]] == True).to_numpy()
+    wait_mat = df_res[[col_wait for _, col_wait in stations_map.values()]].to_numpy(dtype=np.float64)
+
+    # Langform (Station, Bin, Wartezeit) über alle Stationen, ohne DataFrame je Station
+    station_codes, pax_idx = np.nonzero(used_mat.T)
+    df_long = pd.DataFrame({
+        "station": pd.Categorical.from_codes(station_codes, categories=labels),
+        "t_bin": pd.Categorical.from_codes(bin_code[pax_idx], categories=full_idx),
+        "wait": wait_mat[pax_idx, station_codes],
+    })
+
+    # P95 je (Station, Bin) in einem einzigen groupby; dichte Kategorien liefern
+    # alle Bins und Stationen, leere Kombinationen werden zu 0
+    z_frame = (
+        df_long.groupby(["t_bin", "station"], observed=False)["wait"]
+        .quantile(0.95)
+        .unstack("station")
+        .fillna(0)
+    )
     
-    # Ergebnis-Dict für Z-Werte
-    z_data = {}
-    
-    # Aggregate for each station
-    for label, (col_used, col_wait) in stations_map.items():
-        # Filtern auf Passagiere, die die Station genutzt haben
-        mask = df_res[col_used] == True
-        df_sub = df_res[mask].copy()
-        
-        if df_sub.empty:
-            z_data[label] = pd.Series(0, index=full_idx)
-        else:
-            df_sub["t_bin"] = (df_sub["arrival_min"] // bin_min).astype(int) * bin_min
-            # Mean wait per bin
-            grouped = df_sub.groupby("t_bin")[col_wait].quantile(0.95)
-            z_data[label] = grouped.reindex(full_idx, fill_value=0)
-    
-    x = _to_time_axis(t0, pd.Series(full_idx))
+    x = _time_axis_for_range(t0, start_bin, end_bin, bin_min)
     
     # Y-Achse und Z-Daten vorbereiten (Reihenfolge für Anzeige)
     # Plotly Y-Achse ist Bottom-to-Top.
@@ -661,8 +756,9 @@ def _get_wait_heatmap_traces(
     if show_sss:
         ordered_keys.append("SSS (Kiosk)")
         
-    z = [z_data[k].values for k in ordered_keys]
-    text_z = [[f'{val:.1f}' if val > 0 else '' for val in row] for row in z]
+    # Z-Matrix (Stationen x Bins) direkt als ein zusammenhängendes 2D-Array
+    z = z_frame[ordered_keys].to_numpy(dtype=np.float64).T
+    text_z = np.where(z > 0, np.char.mod('%.1f', z), '').tolist()
     
     # Definieren der diskreten Farbskala
     zmax_val = 60.0  # Set a new max for the colorscale to include the >45 range
@@ -691,38 +787,36 @@ def plot_pax_arrival_stacked_bar(df_res: pd.DataFrame, t0: pd.Timestamp, bin_min
         bin_minutes: Breite der Zeitintervalle in Minuten.
     """
     # Define fixed time range first, as it's needed even for empty data
-    day_start = t0.normalize()
-    t_start_fixed = day_start + pd.Timedelta(hours=6)
-    t_end_fixed = day_start + pd.Timedelta(hours=24)
-
-    if df_res.empty:
-        # Create an empty dataframe to show an empty plot with the correct range
-        pax_by_terminal_time = pd.DataFrame()
-    else:
-        # 1. Data prep
-        df_res_copy = df_res.copy() # Avoid SettingWithCopyWarning
-        df_res_copy['arrival_bin'] = (df_res_copy['arrival_min'] // bin_minutes) * bin_minutes
-        pax_by_terminal_time = df_res_copy.groupby(['arrival_bin', 'terminal']).size().unstack(fill_value=0)
+    t_start_fixed, t_end_fixed, min_rel_start, min_rel_end = _fixed_day_window(t0)
 
     # Ensure all bins within the fixed range are present
-    min_rel_start = (t_start_fixed - t0).total_seconds() / 60.0
-    min_rel_end = (t_end_fixed - t0).total_seconds() / 60.0
     start_bin = int(min_rel_start // bin_minutes) * bin_minutes
     end_bin = int(min_rel_end // bin_minutes) * bin_minutes
     
     full_range = pd.RangeIndex(start=start_bin, stop=end_bin + bin_minutes, step=bin_minutes)
-    
-    # Reindex to the full fixed range
-    pax_by_terminal_time = pax_by_terminal_time.reindex(full_range, fill_value=0)
+    n_bins = len(full_range)
+
+    # 1. Data prep: Zählung je (Zeit-Bin, Terminal) per np.bincount, ohne Kopie von df_res
+    pax_by_terminal_time = pd.DataFrame(index=full_range)
+    if not df_res.empty:
+        bin_pos = (df_res["arrival_min"].to_numpy() // bin_minutes).astype(np.int64) - start_bin // bin_minutes
+        in_range = (bin_pos >= 0) & (bin_pos < n_bins)
+        terminals = df_res["terminal"].to_numpy()
+        for term in ["T1", "T2"]:
+            term_mask = terminals == term
+            if term_mask.any():
+                pax_by_terminal_time[term] = np.bincount(bin_pos[term_mask & in_range], minlength=n_bins)
 
     # Convert bin to timestamp for plotting
-    time_bins = _to_time_axis(t0, pax_by_terminal_time.index)
+    time_bins = _time_axis_for_range(t0, start_bin, end_bin + bin_minutes, bin_minutes)
 
     # 2. Plotting
     fig = go.Figure()
     terminals_in_data = [c for c in ["T1", "T2"] if c in pax_by_terminal_time.columns]
-    for term in terminals_in_data:
-        fig.add_trace(go.Bar(x=time_bins, y=pax_by_terminal_time[term], name=f'Terminal {term.strip("T")}', marker_color=TERMINAL_COLORS.get(term)))
+    fig.add_traces([
+        go.Bar(x=time_bins, y=pax_by_terminal_time[term], name=f'Terminal {term.strip("T")}', marker_color=TERMINAL_COLORS.get(term))
+        for term in terminals_in_data
+    ])
     fig.update_layout(
         barmode='stack',
         xaxis_title=None,
@@ -752,19 +846,18 @@ def plot_terminal_overview_combined(
         cfg: Die `SimConfig` des Laufs.
     """
     # Define fixed time range for consistent x-axis across all plots
-    day_start = t0.normalize()
-    t_start_fixed = day_start + pd.Timedelta(hours=6)
-    t_end_fixed = day_start + pd.Timedelta(hours=24)
+    t_start_fixed, t_end_fixed, _, _ = _fixed_day_window(t0)
 
     fig = go.Figure()
 
-    # Add heatmap traces
+    # Add heatmap traces (ist df_res bereits auf das Terminal gefiltert, entfällt die Kopie)
+    terminal_mask = df_res["terminal"].to_numpy() == terminal
+    df_terminal = df_res if terminal_mask.all() else df_res[terminal_mask]
     heatmap_traces, heatmap_y_labels = _get_wait_heatmap_traces(
-        df_res[df_res["terminal"] == terminal], t0, cfg.sss_enabled, bin_minutes_heatmap, t_start_fixed, t_end_fixed
+        df_terminal, t0, cfg.sss_enabled, bin_minutes_heatmap, t_start_fixed, t_end_fixed
     )
     if heatmap_traces:
-        for trace in heatmap_traces:
-            fig.add_trace(trace)
+        fig.add_traces(heatmap_traces)
         fig.update_yaxes(tickvals=heatmap_y_labels, ticktext=heatmap_y_labels)
     else:
         # Add a placeholder if no data for heatmap
@@ -19,14 +19,17 @@ from parameter import (
 )
 
 
+# Statische Auswahllisten (einmalig beim Import statt bei jedem Rerun)
+_SERVICE_LEVEL_OPTIONS = tuple(TCN_SERVICE_LEVELS.keys())
+_TCN_AT_TARGET_OPTIONS = ("EASYPASS", "EU", "TCN")
+
 # =========================================================
 # Callback-Funktionen für UI-Elemente
 # =========================================================
 
 def _reset_all_settings():
     """Callback-Funktion, um alle Einstellungen auf ihre Standardwerte zurückzusetzen."""
-    for k, v in DEFAULT_SESSION_STATE.items():
-        st.session_state[k] = v
+    st.session_state.update(DEFAULT_SESSION_STATE)
     st.toast("Alle Einstellungen wurden auf Standardwerte zurückgesetzt.", icon="✅")
 
 # =========================================================
@@ -63,7 +66,7 @@ def render_settings_sidebar(show_sim_button: bool = False):
     with st.sidebar.expander("Service Level"):
         st.selectbox(
             "Service Level (TCN & EU)",
-            options=list(TCN_SERVICE_LEVELS.keys()),
+            options=_SERVICE_LEVEL_OPTIONS,
             key="tcn_service_level_key",
             help="Die Simulation erhöht iterativ die Schalteranzahl für TCN und EU, bis die mittlere Wartezeit der jeweiligen Passagiergruppe in jedem 15-Minuten-Intervall unter diesem Wert liegt."
         )
@@ -87,7 +90,7 @@ def render_settings_sidebar(show_sim_button: bool = False):
     # Globale Skalierungs- und Steuerungsparameter
     with st.sidebar.expander("Skalierung & Sonstiges"):
         st.slider("Prozesszeit-Skalierung [%]", 100, 200, key="process_time_scale_pct", help="Globaler Multiplikator für alle Prozesszeiten. Nützlich für Was-wäre-wenn-Analysen.")
-        st.selectbox("TCN-AT Ziel", ["EASYPASS", "EU", "TCN"], key="tcn_at_target", help="Leitet TCN-AT Passagiere fest an eine Prozessstelle.")
+        st.selectbox("TCN-AT Ziel", _TCN_AT_TARGET_OPTIONS, key="tcn_at_target", help="Leitet TCN-AT Passagiere fest an eine Prozessstelle.")
         st.number_input("Max. Simulations-Durchläufe", min_value=1, max_value=10, step=1, key="max_iterations", help="Maximale Anzahl an Iterationen für die automatische Kapazitätsanpassung, um Endlosschleifen zu verhindern.")
 
     st.sidebar.markdown("---")